@@ -4,9 +4,10 @@ os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 os.environ["STREAMLIT_SERVER_FILE_WATCHER_TYPE"] = "poll"
 
 from pathlib import Path
+import hashlib
+import io
 import json
 from typing import List
-import sqlite3
 
 import streamlit as st
 from PIL import Image
@@ -15,8 +16,8 @@ from config import (
     GOOGLE_API_KEY, PDF_PATH, INDEX_PATH, CATEGORIES, HARMFUL_CATEGORIES
 )
 from styles import inject_button_css
-from core.pdf_utils import load_pdf_text
-from core.vector_store import load_or_create_vector_store, faiss_files_exist
+from core.pdf_utils import load_pdf_text_cached
+from core.vector_store import load_or_create_vector_store, faiss_files_exist, index_has_sv
 from core.ocr import ocr_image_to_text, extract_ingredient_list
 from core.classify import classify_with_rag
 from core.utils import group_by_category, make_downloads
@@ -24,6 +25,7 @@ from core.eu_additives import (
     enrich_items_with_eu,
     query_eu_additive,
     bulk_refresh_eu_codes,
+    db_recent_rows,
     DB_PATH,  # from eu_additives for DB status view
 )
 
@@ -51,6 +53,7 @@ defaults = {
     "ingredients_confirmed_text": "",
     "ingredients_confirmed": False,
     "translate_sv": True,  # allow Swedish enrichment via Gemini when key exists
+    "_ocr_cache": {},      # (image hash, lang) -> OCR text; reruns with the same image skip OCR
 }
 for k, v in defaults.items():
     if k not in st.session_state:
@@ -63,9 +66,9 @@ for k, v in defaults.items():
 def _cached_vector_store(pdf_path_str: str, index_path_str: str):
     return load_or_create_vector_store(Path(pdf_path_str), Path(index_path_str), force_rebuild=False, verbose=False)
 
-@st.cache_data(show_spinner=False)
 def _cached_pdf_text(pdf_path_str: str) -> str:
-    return load_pdf_text(Path(pdf_path_str))
+    # Plaintext sidecar next to the FAISS index: one file read per rerun, no hash/pickle of the PDF text
+    return load_pdf_text_cached(Path(pdf_path_str), INDEX_PATH)
 
 # ----------------------------------------------------
 # Load index & PDF (reused across reruns)
@@ -73,13 +76,18 @@ def _cached_pdf_text(pdf_path_str: str) -> str:
 preexisting = faiss_files_exist(INDEX_PATH)
 label = "Loading existing FAISS index" if preexisting else "Building FAISS index (first time)"
 with st.spinner(f"{label}: {PDF_PATH.name}"):
-    if not PDF_PATH.exists():
+    # A persisted index is trusted as-is; the PDF is only required to build one
+    if not preexisting and not PDF_PATH.exists():
         st.error(f"PDF not found at: {PDF_PATH.resolve()}")
         st.stop()
     vector_store = _cached_vector_store(str(PDF_PATH), str(INDEX_PATH))
 
 st.success(f"FAISS ready at: {INDEX_PATH}")
 PDF_TEXT = _cached_pdf_text(str(PDF_PATH))
+# The PDF text is the classifier's sole authority; without it every item would come back NotInPDF
+if not PDF_TEXT:
+    st.error(f"No PDF text available: {PDF_PATH.resolve()} is missing/unreadable and no cached text in {INDEX_PATH}")
+    st.stop()
 
 # Optional: show FAISS files present on disk (quick sanity check)
 try:
@@ -134,12 +142,10 @@ with st.sidebar:
         if Path(DB_PATH).exists():
             try:
                 import pandas as pd
-                with sqlite3.connect(DB_PATH) as conn:
-                    df = pd.read_sql_query(
-                        "SELECT e_code, official_name_en, function_en, policy_item_id, updated_at "
-                        "FROM eu_additives ORDER BY datetime(updated_at) DESC LIMIT 10",
-                        conn,
-                    )
+                df = pd.DataFrame(
+                    db_recent_rows(10),
+                    columns=["e_code", "official_name_en", "function_en", "policy_item_id", "updated_at"],
+                )
                 st.dataframe(df, use_container_width=True)
             except Exception as e:
                 st.warning(f"Could not read DB: {e}")
@@ -159,10 +165,26 @@ st.caption("Tip: use **eng+swe** for mixed labels.")
 # ----------------------------------------------------
 # Camera & upload
 # ----------------------------------------------------
+OCR_CACHE_MAX = 16
+OCR_TIMEOUT_S = 120  # a hung tesseract process is killed instead of blocking the script
+
 def _run_ocr_from_file(file) -> str:
     try:
-        img = Image.open(file).convert("RGB")
-        return ocr_image_to_text(img, lang=st.session_state.ocr_lang)
+        data = file.getvalue()
+        key = (hashlib.blake2b(data, digest_size=16).hexdigest(), st.session_state.ocr_lang)
+        cache = st.session_state._ocr_cache
+        if key in cache:
+            return cache[key]
+
+        img = Image.open(io.BytesIO(data))
+        with st.spinner("Running OCR…"):
+            text = ocr_image_to_text(img, lang=st.session_state.ocr_lang, timeout=OCR_TIMEOUT_S)
+        if not text:
+            return ""  # errors were already reported; don't cache them
+        if len(cache) >= OCR_CACHE_MAX:
+            cache.pop(next(iter(cache)))  # drop the oldest entry
+        cache[key] = text
+        return text
     except Exception as e:
         st.warning(f"Could not read image: {e}")
         return ""
@@ -251,7 +273,8 @@ run_btn = st.button("🔬 Analyze & Create Report", disabled=not ingredients)
 if run_btn:
     with st.spinner("Classifying from PDF and enriching NotInPDF items via EU registry…"):
         results = classify_with_rag(
-            vector_store, ingredients, PDF_TEXT, GOOGLE_API_KEY
+            vector_store, ingredients, PDF_TEXT, GOOGLE_API_KEY,
+            sv_probes=index_has_sv(INDEX_PATH),
         )
         items = results.get("items", [])
 
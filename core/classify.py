@@ -1,10 +1,12 @@
 # core/classify.py
+import re
+from functools import lru_cache
 from typing import List, Dict
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-from .vector_store import similarity_docs
+from .vector_store import similarity_docs_batch
 from .json_utils import parse_json_strict
 from .prompts import USER_PROMPT_TMPL
 from .eu_additives import enrich_items_with_eu  # optional enrichment hook
@@ -16,9 +18,46 @@ SV_KEYS = [
     "texturmedel", "klumpförebyggande", "degförbättringsmedel", "nitrit", "nitrat"
 ]
 
+# Prompt templates are compiled once per process, not per classify call
+_CLASSIFY_PROMPT = PromptTemplate(
+    template=USER_PROMPT_TMPL,
+    input_variables=["context", "ingredients", "pdf_risk_guide"],
+    template_format="jinja2",
+)
+_REPAIR_PROMPT = PromptTemplate(
+    template=(
+        "Return ONLY valid JSON matching this schema (no prose, no fences):\n"
+        "{% raw %}{\"items\": [{\"ingredient\": \"<name>\", \"e_code\": \"<E#|''>\", \"category\": \"<PDF category|None>\", \"risk\": \"<PDF term|Unknown>\", \"red_flag\": true|false, \"reason\": \"<short>\", \"source\":\"PDF|NotInPDF\", \"pdf_evidence\":\"<short>\"}] }{% endraw %}\n\n"
+        "Rewrite the following as valid JSON only:\n\n{{ raw }}"
+    ),
+    input_variables=["raw"],
+    template_format="jinja2",
+)
+
+# Keep only the best few snippets per ingredient in the prompt
+CONTEXT_TOP_M = 5
+_WORD_RE = re.compile(r"\w+")
+
+def _rerank_snippets(term: str, snippets: List[str], top_m: int = CONTEXT_TOP_M) -> List[str]:
+    """
+    Dedupe snippets, then keep the top_m by lexical overlap with the ingredient's tokens.
+    Ties keep retrieval order (stable sort).
+    """
+    term_tokens = set(_WORD_RE.findall(term.lower()))
+    seen, unique = set(), []
+    for snip in snippets:
+        h = hash(snip[:200])
+        if h not in seen:
+            seen.add(h)
+            unique.append(snip)
+    unique.sort(key=lambda snip: len(term_tokens & set(_WORD_RE.findall(snip.lower()))), reverse=True)
+    return unique[:top_m]
+
+@lru_cache(maxsize=4)
 def get_llm(temp: float, google_api_key: str):
     """
     Deterministic Gemini LLM for classification (PDF-only authority).
+    Cached per (temp, key) so reruns share one client/channel.
     """
     return ChatGoogleGenerativeAI(
         model="gemini-2.5-flash",
@@ -26,6 +65,14 @@ def get_llm(temp: float, google_api_key: str):
         google_api_key=google_api_key,
     )
 
+@lru_cache(maxsize=4)
+def _get_chains(google_api_key: str):
+    """
+    (classify, repair) chains over the cached LLM; built once per key instead of per run.
+    """
+    llm = get_llm(temp=0.0, google_api_key=google_api_key)
+    return _CLASSIFY_PROMPT | llm | StrOutputParser(), _REPAIR_PROMPT | llm | StrOutputParser()
+
 def classify_with_rag(
     vs,
     ingredients: List[str],
@@ -33,41 +80,29 @@ def classify_with_rag(
     google_api_key: str,
     do_eu_enrichment: bool = False,
     translate_sv: bool = True,
+    sv_probes: bool = True,
 ) -> Dict:
     """
     RAG classification using ONLY the PDF as authority. Optionally enrich NotInPDF via EU registry.
+    Set sv_probes=False for PDFs without Swedish content (see vector_store.index_has_sv).
     """
-    # Build retrieval context per term (EN+SV probes)
-    context_blobs = []
-    for term in ingredients:
-        docs = similarity_docs(vs, term, k=3)
-        if docs:
-            snippet = "\n---\n".join(d.page_content[:800] for d in docs)
-            context_blobs.append(f"### {term}\n{snippet}")
+    # Build retrieval context per term (EN+SV probes), embedded and searched in one batch.
+    # Top-1 of a k=3 search equals a k=1 search, so SV probes reuse the same call.
+    sv_keys = SV_KEYS if sv_probes else []
+    queries = ingredients + [f"{t} {sv}" for t in ingredients for sv in sv_keys]
+    hits = similarity_docs_batch(vs, queries, k=3)
+    n_terms, n_sv = len(ingredients), len(sv_keys)
 
-        for sv_key in SV_KEYS:
-            docs_sv = similarity_docs(vs, f"{term} {sv_key}", k=1)
-            if docs_sv:
-                context_blobs.append(f"### {term} (sv match: {sv_key})\n{docs_sv[0].page_content[:800]}")
+    context_blobs = []
+    for i, term in enumerate(ingredients):
+        snippets = [d.page_content[:800] for d in hits[i]]
+        sv_hits = hits[n_terms + i * n_sv: n_terms + (i + 1) * n_sv]
+        snippets += [docs_sv[0].page_content[:800] for docs_sv in sv_hits if docs_sv]
+        if snippets:
+            context_blobs.append(f"### {term}\n" + "\n---\n".join(_rerank_snippets(term, snippets)))
     context_joined = "\n\n".join(context_blobs) if context_blobs else "(no relevant PDF passages found)"
 
-    prompt = PromptTemplate(
-        template=USER_PROMPT_TMPL,
-        input_variables=["context", "ingredients", "pdf_risk_guide"],
-        template_format="jinja2",
-    )
-    llm = get_llm(temp=0.0, google_api_key=google_api_key or "")
-
-    chain = (
-        {
-            "context": lambda x: x["context"],
-            "ingredients": lambda x: x["ingredients"],
-            "pdf_risk_guide": lambda x: x["pdf_risk_guide"],
-        }
-        | prompt
-        | llm
-        | StrOutputParser()
-    )
+    chain, repair_chain = _get_chains(google_api_key or "")
 
     raw = chain.invoke({
         "context": context_joined,
@@ -81,16 +116,7 @@ def classify_with_rag(
         if "items" not in data or not isinstance(data["items"], list):
             raise ValueError("Missing or invalid 'items'")
     except Exception:
-        fixer = PromptTemplate(
-            template=(
-                "Return ONLY valid JSON matching this schema (no prose, no fences):\n"
-                "{% raw %}{\"items\": [{\"ingredient\": \"<name>\", \"e_code\": \"<E#|''>\", \"category\": \"<PDF category|None>\", \"risk\": \"<PDF term|Unknown>\", \"red_flag\": true|false, \"reason\": \"<short>\", \"source\":\"PDF|NotInPDF\", \"pdf_evidence\":\"<short>\"}] }{% endraw %}\n\n"
-                "Rewrite the following as valid JSON only:\n\n{{ raw }}"
-            ),
-            input_variables=["raw"],
-            template_format="jinja2",
-        )
-        repaired = (fixer | llm | StrOutputParser()).invoke({"raw": raw})
+        repaired = repair_chain.invoke({"raw": raw})
         data = parse_json_strict(repaired)
         if "items" not in data or not isinstance(data["items"], list):
             raise ValueError("Missing or invalid 'items' after fix")
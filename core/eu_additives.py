@@ -1,18 +1,26 @@
 # core/eu_additives.py
 from __future__ import annotations
 
+import codecs
 import csv
+import hashlib
 import json
 import os
 import re
 import sqlite3
+import threading
 import time
-from datetime import datetime, timedelta
-from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import requests
+from cachetools import TLRUCache
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from .json_utils import parse_json_strict
 from config import GOOGLE_API_KEY
@@ -20,6 +28,8 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 
+GEMINI_MODEL = "gemini-2.5-flash"  # EN->SV translation model (also part of the translation cache key)
+
 # =============================================================================
 # EU API (keys OPTIONAL; code works without them)
 # =============================================================================
@@ -33,58 +43,137 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 HDR_API_KEY = os.getenv("OCP_APIM_SUBSCRIPTION_KEY", "").strip()
 QRY_API_KEY = os.getenv("EU_FOOD_ADD_SUBSCRIPTION_KEY", "").strip()
 
+# Set EU_API_DEBUG=1 to keep raw API responses under DATA_DIR
+_DEBUG_RAW = os.getenv("EU_API_DEBUG", "").strip() == "1"
+
 DEFAULT_HEADERS = {
     "User-Agent": "FoodAdditivesClient/1.0 (+your-app)",
     "Accept": "*/*",
     "Content-Type": "application/json",
 }
 
+# Pooled keep-alive session: reuses TCP/TLS connections across calls and worker threads.
+# Static headers and the optional keys are set once here instead of per request.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,  # hand the final response back; callers check status_code
+    ),
+))
+_SESSION.headers.update(DEFAULT_HEADERS)
+if HDR_API_KEY:
+    _SESSION.headers["Ocp-Apim-Subscription-Key"] = HDR_API_KEY
+if QRY_API_KEY:
+    _SESSION.params = {"subscription-key": QRY_API_KEY}
+FETCH_WORKERS = 8  # concurrent EU API lookups (network-bound)
+
+# Politeness: token bucket shared by all threads. Up to EU_API_BURST requests go out at once,
+# then starts are throttled to EU_API_RATE per second; a lone lookup never waits.
+EU_API_RATE = 5.0
+EU_API_BURST = 5
+
+class TokenBucket:
+    """
+    Minimal thread-safe token bucket. acquire() reserves a token under the lock and
+    sleeps outside it, so waiting callers queue up in order without blocking each other.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+_RATE_LIMITER = TokenBucket(rate=EU_API_RATE, capacity=EU_API_BURST)
+
 # =============================================================================
 # SQLite cache
 # =============================================================================
 DB_PATH = DATA_DIR / "eu_additives.db"
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-# L1 in-memory cache for this process
-L1_CACHE: dict[str, dict] = {}
+# One process-wide connection (WAL: readers don't block the writer); all access goes through _DB_LOCK
+_DB_LOCK = threading.Lock()
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+    return conn
+
+_CONN = _connect()
+
 TTL_DAYS = 180  # refresh API rows after ~6 months
+TTL_SECONDS = TTL_DAYS * 86400
+MISSING_TTL_SECONDS = 3600  # "not found in EU API" tombstones are retried after an hour
 
 # =============================================================================
 # E-code utilities
 # =============================================================================
-_ECODE_RE = re.compile(r"(?i)\bE\s*[- ]?\s*\d{3}[a-z]?\b")
-
+_ECODE_RE = re.compile(r"(?i)\bE\s*[- ]?\s*(\d{3}[a-z]?)\b")
+_FAST_ECODE_RE = re.compile(r"E\d{3}[A-Z]?")                   # already canonical
+_STORAGE_ECODE_RE = re.compile(r"E?\s*[- ]?\s*(\d{3}[A-Z]?)")   # on upper-cased input
+_QUERY_ECODE_RE = re.compile(r"E\s*[- ]?\s*(\d{3}[A-Z]?)")
+_SEP_RE = re.compile(r"[\s-]+")
+_NON_DIGIT_RE = re.compile(r"\D")
+
+@lru_cache(maxsize=4096)
 def normalize_e_code_storage(s: str) -> str:
     """
     Storage-normalized canonical form: E250, E211a (no spaces/hyphens).
+    Memoized: called per row/candidate on every lookup over a tiny key space.
     """
     if not s:
         return ""
+    if _FAST_ECODE_RE.fullmatch(s):
+        return s
     s = s.strip().upper()
-    s = re.sub(r"[\s-]+", "", s)
+    m = _STORAGE_ECODE_RE.fullmatch(s)
+    if m:
+        return "E" + m.group(1)
+    s = _SEP_RE.sub("", s)
     if not s.startswith("E"):
         s = "E" + s
     return s
 
-def normalize_e_code_query_variants(s: str) -> List[str]:
+@lru_cache(maxsize=4096)
+def normalize_e_code_query_variants(s: str) -> Tuple[str, ...]:
     """
     EU endpoint often expects 'E 250' but sometimes 'E250' or 'E-250'.
-    Try all variants.
+    Try all variants. Memoized, hence an immutable tuple.
     """
-    s = s.strip().upper()
-    m = re.search(r"(?i)E\s*[- ]?\s*(\d{3}[A-Z]?)", s)
+    s = (s or "").strip().upper()
+    m = _QUERY_ECODE_RE.search(s)
     if not m:
         # If user passed just numbers like "250", still try variants
-        core = re.sub(r"\D", "", s)
-        return [f"E {core}", f"E{core}", f"E-{core}"] if core else [s]
+        core = _NON_DIGIT_RE.sub("", s)
+        return (f"E {core}", f"E{core}", f"E-{core}") if core else (s,)
     core = m.group(1)
-    return [f"E {core}", f"E{core}", f"E-{core}"]
+    return (f"E {core}", f"E{core}", f"E-{core}")
 
 def extract_e_code_from_text(text: str) -> str:
     if not text:
         return ""
     m = _ECODE_RE.search(text)
-    return normalize_e_code_storage(m.group(0)) if m else ""
+    return "E" + m.group(1).upper() if m else ""
 
 # =============================================================================
 # DB helpers
@@ -92,18 +181,67 @@ def extract_e_code_from_text(text: str) -> str:
 def _utcnow() -> str:
     return datetime.utcnow().isoformat(timespec="seconds")
 
-def _is_expired(ts: Optional[str], days: int = TTL_DAYS) -> bool:
-    if not ts:
-        return True
+def _epoch_now() -> int:
+    return int(time.time())
+
+def _legacy_epoch(ts: Optional[str]) -> int:
+    """
+    Epoch seconds from a naive-UTC ISO timestamp (rows written before updated_at_epoch existed).
+    """
     try:
-        return datetime.utcnow() - datetime.fromisoformat(ts) > timedelta(days=days)
+        return int(datetime.fromisoformat(ts).replace(tzinfo=timezone.utc).timestamp()) if ts else 0
     except Exception:
+        return 0
+
+def _row_epoch(eu: Dict[str, Any]) -> int:
+    return eu.get("updated_at_epoch") or _legacy_epoch(eu.get("updated_at"))
+
+def _row_ttl(eu: Dict[str, Any]) -> int:
+    return MISSING_TTL_SECONDS if eu.get("eu_missing") else TTL_SECONDS
+
+def _is_expired(eu: Dict[str, Any]) -> bool:
+    ts = _row_epoch(eu)
+    if not ts:
         return True
+    return time.time() - ts > _row_ttl(eu)
 
-def init_db() -> None:
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute(
+def _tombstone(e_store: str) -> Dict[str, Any]:
+    """
+    Negative-cache entry for an E-code the EU API returned nothing for.
+    """
+    return {"eu_e_code": e_store, "eu_missing": True, "updated_at": _utcnow(), "updated_at_epoch": _epoch_now()}
+
+# L1 in-memory cache for this process, keyed ONLY by storage-normalized E-code (see _l1_get/_l1_put).
+# Entries expire _row_ttl after the row's own updated_at, so a row loaded from SQLite
+# late in its life doesn't get a fresh 180 days; bounded so long sessions don't grow forever.
+L1_CACHE_MAX = 4096
+L1_CACHE: TLRUCache = TLRUCache(
+    maxsize=L1_CACHE_MAX,
+    ttu=lambda _key, eu, _now: _row_epoch(eu) + _row_ttl(eu),
+    timer=time.time,
+)
+_L1_LOCK = threading.Lock()  # cachetools caches are not thread-safe
+
+_DB_READY = False
+
+def init_db(force: bool = False) -> None:
+    """
+    Create/migrate the schema. Runs once per process (at import); later calls are no-ops.
+    force=True reopens the connection at DB_PATH first (so a wiped/replaced DB file is
+    recreated rather than the old, unlinked one kept alive) and empties L1.
+    """
+    global _CONN, _DB_READY
+    if _DB_READY and not force:
+        return
+    with _DB_LOCK:
+        if _DB_READY and not force:
+            return
+        if force:
+            _CONN.close()
+            _CONN = _connect()
+            with _L1_LOCK:
+                L1_CACHE.clear()
+        _CONN.execute(
             """
             CREATE TABLE IF NOT EXISTS eu_additives (
               e_code TEXT PRIMARY KEY,             -- storage-normalized (E250)
@@ -113,18 +251,44 @@ def init_db() -> None:
               payload_json TEXT,                  -- raw API row
               name_sv TEXT,
               function_sv TEXT,
-              updated_at TEXT
+              updated_at TEXT,                    -- ISO, for display/sorting
+              updated_at_epoch INTEGER,           -- unix seconds, for TTL checks
+              missing INTEGER NOT NULL DEFAULT 0  -- 1 = tombstone: not found in EU API
             )
             """
         )
-        c.execute("CREATE INDEX IF NOT EXISTS idx_official_name_en ON eu_additives(official_name_en)")
-        conn.commit()
+        cols = {r[1] for r in _CONN.execute("PRAGMA table_info(eu_additives)")}
+        if "updated_at_epoch" not in cols:  # DBs created before the epoch column
+            _CONN.execute("ALTER TABLE eu_additives ADD COLUMN updated_at_epoch INTEGER")
+        if "missing" not in cols:
+            _CONN.execute("ALTER TABLE eu_additives ADD COLUMN missing INTEGER NOT NULL DEFAULT 0")
+        _CONN.execute("CREATE INDEX IF NOT EXISTS idx_official_name_en ON eu_additives(official_name_en)")
+        _CONN.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+              key TEXT PRIMARY KEY,               -- sha256(model|name_en|function_en)
+              name_sv TEXT,
+              function_sv TEXT,
+              created_at TEXT
+            )
+            """
+        )
+        _DB_READY = True
+
+init_db()  # once per process
 
 def _row_to_dict(row) -> Optional[Dict[str, Any]]:
     if not row:
         return None
     (e_code, official_name_en, function_en, policy_item_id, payload_json,
-     name_sv, function_sv, updated_at) = row
+     name_sv, function_sv, updated_at, updated_at_epoch, missing) = row
+    if missing:
+        return {
+            "eu_e_code": e_code or "",
+            "eu_missing": True,
+            "updated_at": updated_at or "",
+            "updated_at_epoch": updated_at_epoch or 0,
+        }
     return {
         "eu_e_code": e_code or "",
         "eu_official_name": (official_name_en or ""),   # legacy EN alias
@@ -134,77 +298,174 @@ def _row_to_dict(row) -> Optional[Dict[str, Any]]:
         "eu_official_name_sv": (name_sv or ""),
         "eu_function_sv": (function_sv or ""),
         "eu_policy_item_id": (policy_item_id or ""),
-        "eu_raw": json.loads(payload_json) if payload_json else {},
+        "eu_raw": orjson.loads(payload_json) if payload_json else {},
         "updated_at": updated_at or "",
+        "updated_at_epoch": updated_at_epoch or 0,
     }
 
+_ROW_COLUMNS = (
+    "e_code, official_name_en, function_en, policy_item_id, payload_json, "
+    "name_sv, function_sv, updated_at, updated_at_epoch, missing"
+)
+
 def db_get_by_e_code(e_code_storage: str) -> Optional[Dict[str, Any]]:
-    init_db()
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute(
-            "SELECT e_code, official_name_en, function_en, policy_item_id, payload_json, "
-            "name_sv, function_sv, updated_at "
-            "FROM eu_additives WHERE e_code=?",
+    with _DB_LOCK:
+        row = _CONN.execute(
+            f"SELECT {_ROW_COLUMNS} FROM eu_additives WHERE e_code=?",
             (e_code_storage,),
-        )
-        return _row_to_dict(c.fetchone())
+        ).fetchone()
+    return _row_to_dict(row)
+
+def db_get_many(e_codes_storage: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    One SELECT ... WHERE e_code IN (...) for many storage-normalized codes.
+    Returns {e_code: row dict} for the codes present.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    codes = list(dict.fromkeys(c for c in e_codes_storage if c))
+    for i in range(0, len(codes), 500):  # stay under SQLite's bound-parameter limit
+        batch = codes[i:i + 500]
+        with _DB_LOCK:
+            rows = _CONN.execute(
+                f"SELECT {_ROW_COLUMNS} FROM eu_additives "
+                f"WHERE e_code IN ({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+        for row in rows:
+            out[row[0]] = _row_to_dict(row)
+    return out
+
+_UPSERT_SQL = """
+INSERT INTO eu_additives
+  (e_code, official_name_en, function_en, policy_item_id, payload_json, name_sv, function_sv,
+   updated_at, updated_at_epoch, missing)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(e_code) DO UPDATE SET
+  official_name_en=excluded.official_name_en,
+  function_en=excluded.function_en,
+  policy_item_id=excluded.policy_item_id,
+  payload_json=excluded.payload_json,
+  name_sv=excluded.name_sv,
+  function_sv=excluded.function_sv,
+  updated_at=excluded.updated_at,
+  updated_at_epoch=excluded.updated_at_epoch,
+  missing=excluded.missing
+"""
+
+# Tombstones only insert or refresh other tombstones; a real row (even an expired one)
+# is never blanked by a "not found" answer.
+_TOMBSTONE_SQL = """
+INSERT INTO eu_additives
+  (e_code, official_name_en, function_en, policy_item_id, payload_json, name_sv, function_sv,
+   updated_at, updated_at_epoch, missing)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(e_code) DO UPDATE SET
+  updated_at=excluded.updated_at,
+  updated_at_epoch=excluded.updated_at_epoch
+WHERE eu_additives.missing=1
+"""
+
+def _upsert_params(eu: Dict[str, Any]) -> Tuple:
+    return (
+        eu.get("eu_e_code", ""),
+        eu.get("eu_official_name_en", ""),
+        eu.get("eu_function_en", ""),
+        eu.get("eu_policy_item_id", ""),
+        orjson.dumps(eu.get("eu_raw", {})).decode(),  # UTF-8, non-ASCII kept as-is
+        eu.get("eu_official_name_sv", ""),
+        eu.get("eu_function_sv", ""),
+        eu.get("updated_at", _utcnow()),
+        eu.get("updated_at_epoch") or _epoch_now(),
+        1 if eu.get("eu_missing") else 0,
+    )
 
 def db_upsert(eu: Dict[str, Any]) -> None:
-    init_db()
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute(
-            """
-            INSERT INTO eu_additives
-              (e_code, official_name_en, function_en, policy_item_id, payload_json, name_sv, function_sv, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(e_code) DO UPDATE SET
-              official_name_en=excluded.official_name_en,
-              function_en=excluded.function_en,
-              policy_item_id=excluded.policy_item_id,
-              payload_json=excluded.payload_json,
-              name_sv=excluded.name_sv,
-              function_sv=excluded.function_sv,
-              updated_at=excluded.updated_at
-            """,
-            (
-                eu.get("eu_e_code", ""),
-                eu.get("eu_official_name_en", ""),
-                eu.get("eu_function_en", ""),
-                eu.get("eu_policy_item_id", ""),
-                json.dumps(eu.get("eu_raw", {}), ensure_ascii=False),
-                eu.get("eu_official_name_sv", ""),
-                eu.get("eu_function_sv", ""),
-                eu.get("updated_at", _utcnow()),
-            ),
+    params = _upsert_params(eu)
+    with _DB_LOCK:
+        _CONN.execute(_TOMBSTONE_SQL if eu.get("eu_missing") else _UPSERT_SQL, params)
+
+def db_upsert_many(rows: List[Dict[str, Any]]) -> None:
+    """
+    Bulk upsert in ONE transaction (one fsync instead of one per row).
+    Durability is relaxed only for the duration of the load.
+    """
+    if not rows:
+        return
+    params = [_upsert_params(eu) for eu in rows if not eu.get("eu_missing")]
+    tomb_params = [_upsert_params(eu) for eu in rows if eu.get("eu_missing")]
+    with _DB_LOCK:
+        _CONN.execute("PRAGMA synchronous=OFF")
+        try:
+            _CONN.execute("BEGIN")
+            try:
+                _CONN.executemany(_UPSERT_SQL, params)
+                _CONN.executemany(_TOMBSTONE_SQL, tomb_params)
+                _CONN.execute("COMMIT")
+            except Exception:
+                _CONN.execute("ROLLBACK")
+                raise
+        finally:
+            _CONN.execute("PRAGMA synchronous=NORMAL")
+
+def _translation_key(name_en: str, function_en: str) -> str:
+    return hashlib.sha256(f"{GEMINI_MODEL}|{name_en or ''}|{function_en or ''}".encode("utf-8")).hexdigest()
+
+def db_get_translations(keys: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Cached EN->SV translations by _translation_key (one IN query).
+    """
+    out: Dict[str, Dict[str, str]] = {}
+    keys = list(dict.fromkeys(k for k in keys if k))
+    for i in range(0, len(keys), 500):
+        batch = keys[i:i + 500]
+        with _DB_LOCK:
+            rows = _CONN.execute(
+                f"SELECT key, name_sv, function_sv FROM translations WHERE key IN ({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+        for key, name_sv, function_sv in rows:
+            out[key] = {"name_sv": name_sv or "", "function_sv": function_sv or ""}
+    return out
+
+def db_put_translations(translations: Dict[str, Dict[str, str]]) -> None:
+    if not translations:
+        return
+    now = _utcnow()
+    params = [(k, t.get("name_sv", ""), t.get("function_sv", ""), now) for k, t in translations.items()]
+    with _DB_LOCK:
+        _CONN.executemany(
+            "INSERT OR REPLACE INTO translations (key, name_sv, function_sv, created_at) VALUES (?, ?, ?, ?)",
+            params,
         )
-        conn.commit()
 
 # =============================================================================
 # EU API calls (JSON first, CSV fallback)
 # =============================================================================
+def _dump_raw(params: Dict[str, Any], resp: requests.Response, ext: str) -> None:
+    """
+    Save the raw API body for debugging (EU_API_DEBUG=1 only). One file per query,
+    so concurrent lookups don't overwrite each other.
+    """
+    if not _DEBUG_RAW:
+        return
+    tag = hashlib.sha1(repr(sorted(params.items())).encode("utf-8")).hexdigest()[:12]
+    (DATA_DIR / f"food_additives_details_raw_{tag}.{ext}").write_bytes(resp.content)
+
 def _http_get(params: Dict[str, Any], timeout: int = 45) -> requests.Response:
     merged = {"format": "json", "api-version": API_VERSION, **params}
-    if QRY_API_KEY:
-        merged["subscription-key"] = QRY_API_KEY
-    headers = DEFAULT_HEADERS.copy()
-    if HDR_API_KEY:
-        headers["Ocp-Apim-Subscription-Key"] = HDR_API_KEY
-    resp = requests.get(BASE_URL, params=merged, headers=headers, timeout=timeout)
-    # Save raw for debugging
-    (DATA_DIR / "food_additives_details_raw.json").write_bytes(resp.content)
+    _RATE_LIMITER.acquire()
+    resp = _SESSION.get(BASE_URL, params=merged, timeout=timeout)
+    _dump_raw(merged, resp, "json")
     return resp
 
 def _http_get_csv(params: Dict[str, Any], timeout: int = 45) -> requests.Response:
+    """
+    Opened with stream=True; the caller reads the body line by line and must close it.
+    """
     merged = {"format": "csv", "api-version": API_VERSION, **params}
-    if QRY_API_KEY:
-        merged["subscription-key"] = QRY_API_KEY
-    headers = DEFAULT_HEADERS.copy()
-    if HDR_API_KEY:
-        headers["Ocp-Apim-Subscription-Key"] = HDR_API_KEY
-    resp = requests.get(BASE_URL, params=merged, headers=headers, timeout=timeout)
-    (DATA_DIR / "food_additives_details_raw.csv").write_bytes(resp.content)
+    _RATE_LIMITER.acquire()
+    resp = _SESSION.get(BASE_URL, params=merged, timeout=timeout, stream=True)
+    _dump_raw(merged, resp, "csv")
     return resp
 
 def _extract_rows_from_json(data: Any) -> List[Dict[str, Any]]:
@@ -226,25 +487,56 @@ def _extract_rows_from_json(data: Any) -> List[Dict[str, Any]]:
         return [data]
     return []
 
-def _api_get_rows_json(params: Dict[str, Any], timeout: int = 45) -> List[Dict[str, Any]]:
+# The row fetchers return None when the request failed (network error, timeout, non-200,
+# unparsable body) and a list, possibly empty, when the API actually answered. Only the
+# latter may be negative-cached.
+def _api_get_rows_json(params: Dict[str, Any], timeout: int = 45) -> Optional[List[Dict[str, Any]]]:
     try:
         resp = _http_get(params, timeout=timeout)
         if resp.status_code != 200:
-            return []
-        data = resp.json()
+            return None
+        data = orjson.loads(resp.content)
         return _extract_rows_from_json(data)
     except Exception:
-        return []
+        return None
 
-def _api_get_rows_csv(params: Dict[str, Any], timeout: int = 45) -> List[Dict[str, Any]]:
+def _api_get_rows_csv(params: Dict[str, Any], timeout: int = 45) -> Optional[List[Dict[str, Any]]]:
     try:
-        resp = _http_get_csv(params, timeout=timeout)
-        if resp.status_code != 200:
-            return []
-        text = resp.text
-        return list(csv.DictReader(StringIO(text)))
+        with _http_get_csv(params, timeout=timeout) as resp:
+            if resp.status_code != 200:
+                return None
+            # iter_lines strips terminators; put them back so quoted multi-line fields survive
+            lines = (line + "\n" for line in codecs.iterdecode(resp.iter_lines(), resp.encoding or "utf-8-sig"))
+            return list(csv.DictReader(lines, restkey="_extra"))
     except Exception:
-        return []
+        return None
+
+def _api_get_rows(params: Dict[str, Any], timeout: int = 45) -> Optional[List[Dict[str, Any]]]:
+    """
+    JSON, then CSV if JSON gave nothing. None only if neither request got an answer.
+    """
+    rows = _api_get_rows_json(params, timeout=timeout)
+    if rows:
+        return rows
+    rows_csv = _api_get_rows_csv(params, timeout=timeout)
+    if rows_csv is None:
+        return rows
+    return rows_csv
+
+_ECODE_KEYS = ("additive_e_code", "e_code", "E_number", "e_number", "code")
+
+def _pick(d: Dict[str, Any], *keys: str) -> str:
+    """
+    First non-empty value among keys, as str ("" if none).
+    """
+    for k in keys:
+        v = d.get(k)
+        if v not in (None, ""):
+            return str(v)
+    return ""
+
+def _is_substance_fad(r: Dict[str, Any]) -> bool:
+    return str(r.get("additive_type", "") or r.get("type", "") or "").lower() == "substancefad"
 
 def _prefer_substance_match(rows: List[Dict[str, Any]], e_code_norm: str) -> Optional[Dict[str, Any]]:
     """
@@ -253,75 +545,67 @@ def _prefer_substance_match(rows: List[Dict[str, Any]], e_code_norm: str) -> Opt
       2) exact normalized e_code (any type)
       3) any 'substanceFAD'
       4) fallback: first row
+    Single pass; returns as soon as a tier-1 row is seen. The (cheap) type check runs
+    first: once a tier-2 row is held, only substanceFAD rows can still improve on it, so
+    the E-code of other rows is never extracted/normalized.
     """
-    def norm(val: str) -> str:
-        return normalize_e_code_storage(val or "")
-    ecode_keys = ["additive_e_code", "e_code", "E_number", "e_number", "code"]
-
-    enriched: List[Tuple[Dict[str, Any], str, str]] = []
+    exact: Optional[Dict[str, Any]] = None
+    substance: Optional[Dict[str, Any]] = None
     for r in rows:
-        e = ""
-        for k in ecode_keys:
-            v = r.get(k)
-            if v not in (None, ""):
-                e = str(v)
-                break
-        e_norm = norm(e)
-        t = str(r.get("additive_type", "") or r.get("type", "") or "")
-        enriched.append((r, e_norm, t))
-
-    for r, e_norm, t in enriched:
-        if e_norm and e_norm == e_code_norm and t.lower() == "substancefad":
-            return r
-    for r, e_norm, _ in enriched:
-        if e_norm and e_norm == e_code_norm:
-            return r
-    for r, _, t in enriched:
-        if t.lower() == "substancefad":
+        is_sub = _is_substance_fad(r)
+        if not is_sub and exact is not None:
+            continue
+        e_norm = normalize_e_code_storage(_pick(r, *_ECODE_KEYS))
+        is_exact = bool(e_norm) and e_norm == e_code_norm
+        if is_exact and is_sub:
             return r
+        if is_exact and exact is None:
+            exact = r
+        if is_sub and substance is None:
+            substance = r
+    if exact is not None:
+        return exact
+    if substance is not None:
+        return substance
     return rows[0] if rows else None
 
 def _query_api_and_normalize(e_code: Optional[str], name: Optional[str], timeout: int = 45) -> Optional[Dict[str, Any]]:
     """
     Returns normalized dict with EN fields (name/function) and IDs.
+    For an E-code the API answered with no rows for (every variant), returns a tombstone
+    (eu_missing=True); None means not found by name, or the lookup failed.
     """
     chosen_row: Optional[Dict[str, Any]] = None
 
     if e_code:
-        variants = normalize_e_code_query_variants(e_code)
-        for variant in variants:
-            params = {"additive_e_code": variant}
-            rows = _api_get_rows_json(params, timeout=timeout)
-            if not rows:
-                rows = _api_get_rows_csv(params, timeout=timeout)
-            if rows:
+        failed = False
+        for variant in normalize_e_code_query_variants(e_code):
+            rows = _api_get_rows({"additive_e_code": variant}, timeout=timeout)
+            if rows is None:
+                failed = True
+            elif rows:
                 chosen_row = _prefer_substance_match(rows, normalize_e_code_storage(variant))
                 if chosen_row:
                     break
+        if not chosen_row:
+            return None if failed else _tombstone(normalize_e_code_storage(e_code))
 
     elif name:
-        params = {"additive_name": name}
-        rows = _api_get_rows_json(params, timeout=timeout)
-        if not rows:
-            rows = _api_get_rows_csv(params, timeout=timeout)
+        rows = _api_get_rows({"additive_name": name}, timeout=timeout)
         if rows:
-            subs = [r for r in rows if str(r.get("additive_type","")).lower() == "substancefad"]
-            chosen_row = subs[0] if subs else rows[0]
+            chosen_row = next(
+                (r for r in rows if str(r.get("additive_type", "")).lower() == "substancefad"),
+                rows[0],
+            )
 
     if not chosen_row:
         return None
 
-    def pick(d: Dict[str, Any], *keys) -> str:
-        for k in keys:
-            if k in d and d[k] not in (None, ""):
-                return str(d[k])
-        return ""
-
-    eu_e_raw   = pick(chosen_row, "additive_e_code", "e_code", "E_number", "e_number", "code")
-    eu_name_en = pick(chosen_row, "additive_name", "name", "Name")
-    eu_func_en = pick(chosen_row, "functional_class", "function", "category")
-    pol_id     = pick(chosen_row, "policy_item_id", "policy_id", "id")
-    fip_url    = pick(chosen_row, "fip_url", "url")
+    eu_e_raw   = _pick(chosen_row, *_ECODE_KEYS)
+    eu_name_en = _pick(chosen_row, "additive_name", "name", "Name")
+    eu_func_en = _pick(chosen_row, "functional_class", "function", "category")
+    pol_id     = _pick(chosen_row, "policy_item_id", "policy_id", "id")
+    fip_url    = _pick(chosen_row, "fip_url", "url")
 
     return {
         "eu_e_code": normalize_e_code_storage(eu_e_raw),
@@ -331,17 +615,19 @@ def _query_api_and_normalize(e_code: Optional[str], name: Optional[str], timeout
         "eu_raw": chosen_row,
         "eu_fip_url": fip_url,
         "updated_at": _utcnow(),
+        "updated_at_epoch": _epoch_now(),
     }
 
 # =============================================================================
 # Swedish enrichment (Gemini + deterministic fallbacks)
 # =============================================================================
+@lru_cache(maxsize=1)
 def _get_llm() -> Optional[ChatGoogleGenerativeAI]:
     if not GOOGLE_API_KEY:
         return None
     try:
         return ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
+            model=GEMINI_MODEL,
             temperature=0.0,
             google_api_key=GOOGLE_API_KEY,
         )
@@ -373,14 +659,28 @@ _TRANSLATE_TMPL = PromptTemplate(
     template_format="jinja2",  # <-- critical
 )
 
-def _translate_to_sv(name_en: str, function_en: str) -> Dict[str, str]:
+@lru_cache(maxsize=1)
+def _get_translate_chain():
     llm = _get_llm()
-    if not llm or (not name_en and not function_en):
+    return (_TRANSLATE_TMPL | llm | StrOutputParser()) if llm else None
+
+def _translate_to_sv(name_en: str, function_en: str) -> Dict[str, str]:
+    """
+    EN->SV via Gemini (temperature 0, so results are cached in the translations table).
+    """
+    if not name_en and not function_en:
         return {"name_sv": "", "function_sv": ""}
+    key = _translation_key(name_en, function_en)
+    cached = db_get_translations([key]).get(key)
+    if cached:
+        return cached
 
-    chain = _TRANSLATE_TMPL | llm | StrOutputParser()
-    raw = chain.invoke({"name_en": name_en or "", "function_en": function_en or ""})
-    try:
+    chain = _get_translate_chain()
+    if not chain:
+        return {"name_sv": "", "function_sv": ""}
+
+    try:  # Gemini errors (429/quota/network) fall back to the deterministic SV fields
+        raw = chain.invoke({"name_en": name_en or "", "function_en": function_en or ""})
         data = parse_json_strict(raw)
     except Exception:
         return {"name_sv": "", "function_sv": ""}
@@ -394,7 +694,91 @@ def _translate_to_sv(name_en: str, function_en: str) -> Dict[str, str]:
     if _is_placeholder_sv(function_sv):
         function_sv = ""
 
-    return {"name_sv": name_sv, "function_sv": function_sv}
+    result = {"name_sv": name_sv, "function_sv": function_sv}
+    db_put_translations({key: result})
+    return result
+
+
+_TRANSLATE_BATCH_TMPL = PromptTemplate(
+    template=(
+        "Translate the EU additive fields of EVERY item below to Swedish.\n"
+        "Return ONLY this JSON (no code fences, no comments), one entry per input item:\n"
+        "{% raw %}{\"items\":[{\"e_code\":\"E250\", \"name_sv\":\"...\", \"function_sv\":\"...\"}]}{% endraw %}\n"
+        "- Copy each e_code exactly as given.\n"
+        "- If you are not sure, return an empty string for that field.\n"
+        "- Do NOT use angle brackets. Do NOT return placeholders.\n"
+        "- Keep chemical names natural for Swedish labeling.\n\n"
+        "Items (JSON):\n{{ items_json }}\n"
+    ),
+    input_variables=["items_json"],
+    template_format="jinja2",
+)
+
+@lru_cache(maxsize=1)
+def _get_translate_batch_chain():
+    llm = _get_llm()
+    return (_TRANSLATE_BATCH_TMPL | llm | StrOutputParser()) if llm else None
+
+TRANSLATE_BATCH_SIZE = 20  # items per Gemini call; keeps prompts/outputs small enough to parse reliably
+
+def _translate_chunk_to_sv(chain, chunk: List[Tuple[str, str, str]]) -> Dict[str, Dict[str, str]]:
+    """
+    One batched Gemini call; returns translations for the chunk's codes that came back parseable.
+    """
+    payload = json.dumps(
+        [{"e_code": e, "name_en": n, "function_en": f} for e, n, f in chunk],
+        ensure_ascii=False,
+    )
+    try:  # a failed call must not lose the batch's EU rows; they get _sv_fallbacks instead
+        raw = chain.invoke({"items_json": payload})
+        data = parse_json_strict(raw)
+    except Exception:
+        return {}
+
+    wanted = {e for e, _, _ in chunk}
+    rows = data.get("items") if isinstance(data, dict) else data
+    out: Dict[str, Dict[str, str]] = {}
+    for r in rows or []:
+        if not isinstance(r, dict):
+            continue
+        code = normalize_e_code_storage(str(r.get("e_code") or ""))
+        if code not in wanted or code in out:
+            continue
+        name_sv = str(r.get("name_sv") or "").strip()
+        function_sv = str(r.get("function_sv") or "").strip()
+        out[code] = {
+            "name_sv": "" if _is_placeholder_sv(name_sv) else name_sv,
+            "function_sv": "" if _is_placeholder_sv(function_sv) else function_sv,
+        }
+    return out
+
+def _translate_batch_to_sv(items: List[Tuple[str, str, str]]) -> Dict[str, Dict[str, str]]:
+    """
+    Translate many (e_code, name_en, function_en) tuples in Gemini calls of up to
+    TRANSLATE_BATCH_SIZE items; cached translations skip the call, and a lone
+    leftover item uses the single-item prompt.
+    Returns {storage-normalized e_code: {"name_sv", "function_sv"}}; missing codes were not translated.
+    """
+    items = [(normalize_e_code_storage(e), n or "", f or "") for e, n, f in items if e and (n or f)]
+    keys = {e: _translation_key(n, f) for e, n, f in items}
+    cached = db_get_translations(list(keys.values()))
+
+    out: Dict[str, Dict[str, str]] = {e: cached[k] for e, k in keys.items() if k in cached}
+    todo = list({e: (e, n, f) for e, n, f in items if e not in out}.values())
+    chain = _get_translate_batch_chain()
+    if not chain or not todo:
+        return out
+
+    for i in range(0, len(todo), TRANSLATE_BATCH_SIZE):
+        chunk = todo[i:i + TRANSLATE_BATCH_SIZE]
+        if len(chunk) == 1:
+            e, n, f = chunk[0]
+            out[e] = _translate_to_sv(n, f)  # caches itself
+            continue
+        fresh = _translate_chunk_to_sv(chain, chunk)
+        out.update(fresh)
+        db_put_translations({keys[e]: t for e, t in fresh.items()})
+    return out
 
 
 # Deterministic overrides to avoid junk + improve UX
@@ -422,6 +806,8 @@ FUNCTION_SV_MAP = {
     "Flavour enhancer": "Smakförstärkare",
     "Flavouring": "Aromämne",
 }
+# Lower-cased once; order preserved so the first matching EN function still wins
+_FUNCTION_SV_MAP_LC = tuple((k.lower(), v) for k, v in FUNCTION_SV_MAP.items())
 FUNCTION_OVERRIDES_BY_ECODE_SV = {
     "E903": "Ytbehandlingsmedel",
     "E967": "Sötningsmedel",
@@ -443,16 +829,125 @@ def _sv_fallbacks(eu: Dict[str, Any]) -> None:
     if _is_placeholder_sv(eu.get("eu_function_sv", "")):
         eu["eu_function_sv"] = ""
     if not eu.get("eu_function_sv") and func_en:
-        for k, v in FUNCTION_SV_MAP.items():
-            if k.lower() in func_en.lower():
+        func_en_lc = func_en.lower()
+        for k_lc, v in _FUNCTION_SV_MAP_LC:
+            if k_lc in func_en_lc:
                 eu["eu_function_sv"] = v
                 break
     if not eu.get("eu_function_sv") and ecode in FUNCTION_OVERRIDES_BY_ECODE_SV:
         eu["eu_function_sv"] = FUNCTION_OVERRIDES_BY_ECODE_SV[ecode]
 
+def _apply_sv_batch(rows: List[Dict[str, Any]]) -> None:
+    """
+    Fill Swedish fields on freshly fetched rows with a single batched translation.
+    """
+    sv = _translate_batch_to_sv([
+        (eu.get("eu_e_code", ""), eu.get("eu_official_name_en", ""), eu.get("eu_function_en", ""))
+        for eu in rows
+    ])
+    for eu in rows:
+        t = sv.get(eu.get("eu_e_code", ""), {})
+        eu["eu_official_name_sv"] = t.get("name_sv", "")
+        eu["eu_function_sv"] = t.get("function_sv", "")
+        _sv_fallbacks(eu)
+
 # =============================================================================
 # Public API
 # =============================================================================
+def _finalize_eu(eu: Dict[str, Any], translate_sv: bool) -> Dict[str, Any]:
+    """
+    Optional Swedish enrichment, deterministic cleanups and legacy aliases for a fresh API row.
+    """
+    if translate_sv:
+        sv = _translate_to_sv(eu.get("eu_official_name_en", ""), eu.get("eu_function_en", ""))
+        eu["eu_official_name_sv"] = sv.get("name_sv", "")
+        eu["eu_function_sv"] = sv.get("function_sv", "")
+    else:
+        eu["eu_official_name_sv"] = ""
+        eu["eu_function_sv"] = ""
+
+    # Deterministic cleanups/overrides
+    _sv_fallbacks(eu)
+
+    # Back-compat English aliases (for CSV/JSON export)
+    eu["eu_official_name"] = eu.get("eu_official_name_en", "")
+    eu["eu_function"]      = eu.get("eu_function_en", "")
+    return eu
+
+def _l1_get(e_code: str) -> Optional[Dict[str, Any]]:
+    key = normalize_e_code_storage(e_code)
+    with _L1_LOCK:
+        return L1_CACHE.get(key)
+
+def _l1_put(eu: Dict[str, Any], *e_codes: str) -> None:
+    """
+    Cache under every given spelling AND the row's own code, all storage-normalized,
+    so "E 250", "e-250" and an API row for E250 share one entry.
+    """
+    for code in (*e_codes, eu.get("eu_e_code", "")):
+        key = normalize_e_code_storage(code)
+        if key:
+            with _L1_LOCK:
+                L1_CACHE[key] = eu
+
+def _cached_eu(e_code: str) -> Optional[Dict[str, Any]]:
+    """
+    L1 then SQLite lookup for an E-code; None if not cached or expired.
+    May return a tombstone (eu_missing=True); callers map that to None without an API call.
+    """
+    e_store = normalize_e_code_storage(e_code)
+    hit = _l1_get(e_store)
+    if hit:
+        return hit
+
+    row = db_get_by_e_code(e_store)
+    if row and not _is_expired(row):
+        _l1_put(row, e_store)
+        return row
+    return None
+
+def _fetch_eu_by_code(e_store: str, timeout: int = 45, translate_sv: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    EU API lookup (JSON then CSV) + optional Swedish enrichment. Does not persist.
+    """
+    eu = _query_api_and_normalize(e_code=e_store, name=None, timeout=timeout)
+    if not eu or eu.get("eu_missing"):
+        return eu
+    return _finalize_eu(eu, translate_sv)
+
+def _fetch_eu_many(codes: List[str], timeout: int = 45, translate_sv: bool = True) -> List[Optional[Dict[str, Any]]]:
+    """
+    _fetch_eu_by_code over many storage-normalized codes, overlapping the HTTP round-trips.
+    Results are in input order.
+    """
+    if not codes:
+        return []
+    workers = min(FETCH_WORKERS, len(codes))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(lambda c: _fetch_eu_by_code(c, timeout=timeout, translate_sv=translate_sv), codes))
+
+def _fetch_and_store(
+    e_code: Optional[str] = None,
+    name: Optional[str] = None,
+    timeout: int = 45,
+    translate_sv: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """
+    Cache-miss worker: EU API (+ optional SV), then upsert and cache. Safe to run in worker threads.
+    """
+    eu = _query_api_and_normalize(e_code=e_code, name=None if e_code else name, timeout=timeout)
+    if not eu:
+        return None
+    if eu.get("eu_missing"):
+        db_upsert(eu)
+        _l1_put(eu)
+        return None
+    _finalize_eu(eu, translate_sv)
+    if eu.get("eu_e_code"):
+        db_upsert(eu)
+        _l1_put(eu, *([e_code] if e_code else []))
+    return eu
+
 def query_eu_additive(
     e_code: Optional[str] = None,
     name: Optional[str] = None,
@@ -465,95 +960,101 @@ def query_eu_additive(
       1) L1 cache (storage-normalized E-code)
       2) SQLite (with TTL)
       3) EU API (JSON then CSV) + optional Swedish enrichment
-      4) Upsert & cache
+      4) Upsert & cache (misses are cached as short-lived tombstones, see MISSING_TTL_SECONDS)
 
     Returns a dict with keys:
       eu_e_code, eu_official_name_en, eu_function_en, eu_policy_item_id,
       eu_official_name_sv, eu_function_sv, eu_fip_url, eu_raw, updated_at, ...
     """
-    init_db()
-
     if e_code:
-        e_store = normalize_e_code_storage(e_code)
-
-        # L1 cache
-        hit = L1_CACHE.get(e_store)
-        if hit and not _is_expired(hit.get("updated_at")):
-            return hit
-
-        # SQLite
-        row = db_get_by_e_code(e_store)
-        if row and not _is_expired(row.get("updated_at")):
-            L1_CACHE[e_store] = row
-            return row
-
-        # EU API
-        eu = _query_api_and_normalize(e_code=e_store, name=None, timeout=timeout)
-        if eu:
-            if translate_sv:
-                sv = _translate_to_sv(eu.get("eu_official_name_en", ""), eu.get("eu_function_en", ""))
-                eu["eu_official_name_sv"] = sv.get("name_sv", "")
-                eu["eu_function_sv"] = sv.get("function_sv", "")
-            else:
-                eu["eu_official_name_sv"] = ""
-                eu["eu_function_sv"] = ""
-
-            # Deterministic cleanups/overrides
-            _sv_fallbacks(eu)
-
-            # Back-compat English aliases (for CSV/JSON export)
-            eu["eu_official_name"] = eu.get("eu_official_name_en", "")
-            eu["eu_function"]      = eu.get("eu_function_en", "")
-
-            db_upsert(eu)
-            L1_CACHE[e_store] = eu
-            time.sleep(0.2)  # polite pacing if user loops many codes
-            return eu
-        return None
+        cached = _cached_eu(e_code)
+        if cached:
+            return None if cached.get("eu_missing") else cached
+        return _fetch_and_store(e_code=normalize_e_code_storage(e_code), timeout=timeout, translate_sv=translate_sv)
 
     if name:
-        eu = _query_api_and_normalize(e_code=None, name=name, timeout=timeout)
-        if eu:
-            if translate_sv:
-                sv = _translate_to_sv(eu.get("eu_official_name_en", ""), eu.get("eu_function_en", ""))
-                eu["eu_official_name_sv"] = sv.get("name_sv", "")
-                eu["eu_function_sv"] = sv.get("function_sv", "")
-            else:
-                eu["eu_official_name_sv"] = ""
-                eu["eu_function_sv"] = ""
-
-            _sv_fallbacks(eu)
-
-            eu["eu_official_name"] = eu.get("eu_official_name_en", "")
-            eu["eu_function"]      = eu.get("eu_function_en", "")
-
-            e_store = eu.get("eu_e_code") or ""
-            if e_store:
-                db_upsert(eu)
-                L1_CACHE[e_store] = eu
-            time.sleep(0.2)
-            return eu
-        return None
+        return _fetch_and_store(name=name, timeout=timeout, translate_sv=translate_sv)
 
     return None
 
+def _resolve_eu_codes(codes: List[str], translate_sv: bool = True, timeout: int = 45) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Batched E-code resolution: L1, then ONE SQLite IN-query for the rest, then concurrent
+    EU API fetches for misses/expired rows, one batched SV translation and ONE upsert transaction.
+    Codes the API answered with no rows for are stored as tombstones alongside the fetched rows.
+    Returns {storage-normalized code: row or None}.
+    """
+    out: Dict[str, Optional[Dict[str, Any]]] = {}
+    pending: List[str] = []
+    for e_store in dict.fromkeys(normalize_e_code_storage(c) for c in codes):
+        if not e_store:
+            continue
+        hit = _l1_get(e_store)
+        if hit:
+            out[e_store] = None if hit.get("eu_missing") else hit
+        else:
+            pending.append(e_store)
+
+    misses: List[str] = []
+    db_rows = db_get_many(pending)
+    for e_store in pending:
+        row = db_rows.get(e_store)
+        if row and not _is_expired(row):
+            _l1_put(row, e_store)
+            out[e_store] = None if row.get("eu_missing") else row
+        else:
+            misses.append(e_store)
+
+    fetched: List[Dict[str, Any]] = []
+    tombstones: List[Dict[str, Any]] = []
+    for e_store, eu in zip(misses, _fetch_eu_many(misses, timeout=timeout, translate_sv=False)):
+        if eu and eu.get("eu_missing"):
+            tombstones.append(eu)
+            eu = None
+        out[e_store] = eu  # None on a failed fetch too; any stored row is left untouched
+        if eu:
+            fetched.append(eu)
+    if translate_sv:
+        _apply_sv_batch(fetched)
+    db_upsert_many(fetched + tombstones)
+    for e_store in misses:
+        if out[e_store]:
+            _l1_put(out[e_store], e_store)
+    for miss in tombstones:
+        _l1_put(miss)
+    return out
+
 def enrich_items_with_eu(items: List[Dict[str, Any]], translate_sv: bool = True) -> List[Dict[str, Any]]:
     """
     Attach EU metadata to items with source != PDF.
     (UI decides whether to display EU line for PDF-backed items.)
+    E-codes are resolved in one batch (see _resolve_eu_codes); name-only items are
+    looked up concurrently, once per distinct name.
     """
-    out: List[Dict[str, Any]] = []
+    targets: List[Tuple[Dict[str, Any], str, str]] = []
     for it in items:
         if it.get("source") == "PDF":
-            out.append(it)
             continue
-
         name = (it.get("ingredient") or "").strip()
         e_code = (it.get("e_code") or "").strip()
         if not e_code:
             e_code = extract_e_code_from_text(name)
+        targets.append((it, normalize_e_code_storage(e_code) if e_code else "", name))
 
-        eu = query_eu_additive(e_code=e_code or None, name=None if e_code else name, translate_sv=translate_sv)
+    by_code = _resolve_eu_codes([code for _, code, _ in targets if code], translate_sv=translate_sv)
+
+    names: Dict[str, str] = {}  # lower-cased key -> first spelling seen
+    for _, code, name in targets:
+        if not code and name:
+            names.setdefault(name.lower(), name)
+    by_name: Dict[str, Optional[Dict[str, Any]]] = {}
+    if names:
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(names))) as ex:
+            found = ex.map(lambda n: query_eu_additive(name=n, translate_sv=translate_sv), names.values())
+            by_name = dict(zip(names, found))
+
+    for it, code, name in targets:
+        eu = by_code.get(code) if code else by_name.get(name.lower())
 
         if eu:
             it["eu_enriched"] = True
@@ -572,21 +1073,16 @@ def enrich_items_with_eu(items: List[Dict[str, Any]], translate_sv: bool = True)
             it["eu_enriched"] = False
             it["eu_source"] = "None"
 
-        out.append(it)
-    return out
+    return list(items)
 
 def bulk_refresh_eu_codes(codes: List[str], translate_sv: bool = True, timeout: int = 45) -> int:
     """
     Pre-fetch & cache a set of E-codes into SQLite (with optional SV enrichment).
+    Misses are fetched concurrently, translated in one batched Gemini call,
+    and written in a single transaction.
     """
-    init_db()
-    ok = 0
-    for raw in codes:
-        e_store = normalize_e_code_storage(raw)
-        eu = query_eu_additive(e_code=e_store, name=None, translate_sv=translate_sv)
-        if eu:
-            ok += 1
-    return ok
+    resolved = _resolve_eu_codes(codes, translate_sv=translate_sv, timeout=timeout)
+    return sum(1 for eu in resolved.values() if eu)
 
 # =============================================================================
 # Debug / probe helpers
@@ -597,29 +1093,24 @@ def eu_api_probe(e_code: str = "E250", timeout: int = 30) -> Dict[str, Any]:
     """
     out = {"ecode": e_code, "attempts": [], "ok": False}
     for variant in normalize_e_code_query_variants(e_code):
-        params = {"additive_e_code": variant}
-        rows = _api_get_rows_json(params, timeout=timeout)
-        if not rows:
-            rows = _api_get_rows_csv(params, timeout=timeout)
-        out["attempts"].append({"variant": variant, "rows": len(rows)})
+        rows = _api_get_rows({"additive_e_code": variant}, timeout=timeout)
+        out["attempts"].append({"variant": variant, "rows": len(rows) if rows is not None else "error"})
         if rows:
             out["ok"] = True
             break
     return out
 
 def db_recent_rows(limit: int = 10) -> List[Tuple]:
-    init_db()
-    with sqlite3.connect(DB_PATH) as conn:
-        cur = conn.cursor()
-        cur.execute(
+    with _DB_LOCK:
+        return _CONN.execute(
             "SELECT e_code, official_name_en, function_en, policy_item_id, updated_at "
-            "FROM eu_additives ORDER BY datetime(updated_at) DESC LIMIT ?",
+            "FROM eu_additives WHERE missing=0 ORDER BY datetime(updated_at) DESC LIMIT ?",
             (int(limit),),
-        )
-        return cur.fetchall()
+        ).fetchall()
 
 def db_get_row(e_code: str) -> Optional[Dict[str, Any]]:
-    return db_get_by_e_code(normalize_e_code_storage(e_code))
+    row = db_get_by_e_code(normalize_e_code_storage(e_code))
+    return None if row and row.get("eu_missing") else row
 
 # =============================================================================
 # CLI (optional)
@@ -2,6 +2,24 @@
 import json
 import re
 
+import orjson
+
+_FENCED_RE = re.compile(r"```json\s*(.+?)\s*```", re.DOTALL | re.IGNORECASE)
+_ANY_FENCE_RE = re.compile(r"```.*?```", re.DOTALL)
+_LINE_COMMENT_RE = re.compile(r"//.*?$", re.MULTILINE)
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_SINGLE_QUOTE_RE = re.compile(r"(?<!\\)'")
+
+def _loads(s: str):
+    """
+    orjson fast path; stdlib fallback for inputs only it accepts (NaN/Infinity literals).
+    """
+    try:
+        return orjson.loads(s)
+    except orjson.JSONDecodeError:
+        return json.loads(s)
+
 def parse_json_strict(raw: str) -> dict:
     """
     Attempts to coerce an LLM response into valid JSON.
@@ -9,16 +27,16 @@ def parse_json_strict(raw: str) -> dict:
     """
     # direct
     try:
-        return json.loads(raw)
+        return _loads(raw)
     except Exception:
         pass
 
     # fenced
-    m = re.search(r"```json\s*(.+?)\s*```", raw, flags=re.DOTALL | re.IGNORECASE)
+    m = _FENCED_RE.search(raw)
     if m:
         block = m.group(1).strip()
         try:
-            return json.loads(block)
+            return _loads(block)
         except Exception:
             raw = block
 
@@ -28,18 +46,18 @@ def parse_json_strict(raw: str) -> dict:
         if start < end:
             candidate = raw[start:end + 1]
             try:
-                return json.loads(candidate)
+                return _loads(candidate)
             except Exception:
                 repaired = candidate.replace("\ufeff", "")
-                repaired = re.sub(r"```.*?```", "", repaired, flags=re.DOTALL)
-                repaired = re.sub(r"//.*?$", "", repaired, flags=re.MULTILINE)
-                repaired = re.sub(r"/\*.*?\*/", "", repaired, flags=re.DOTALL)
-                repaired = re.sub(r",\s*([}\]])", r"\1", repaired)
+                repaired = _ANY_FENCE_RE.sub("", repaired)
+                repaired = _LINE_COMMENT_RE.sub("", repaired)
+                repaired = _BLOCK_COMMENT_RE.sub("", repaired)
+                repaired = _TRAILING_COMMA_RE.sub(r"\1", repaired)
                 if repaired.count("'") > repaired.count('"'):
-                    repaired = re.sub(r"(?<!\\)'", '"', repaired)
+                    repaired = _SINGLE_QUOTE_RE.sub('"', repaired)
                 repaired = repaired.strip()
                 try:
-                    return json.loads(repaired)
+                    return _loads(repaired)
                 except Exception:
                     pass
     raise ValueError("Could not coerce model output to JSON")
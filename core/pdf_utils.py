@@ -1,10 +1,30 @@
 # core/pdf_utils.py
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 from PyPDF2 import PdfReader
 import streamlit as st
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
+# PyPDF2 extraction is pure Python (GIL-bound), so big PDFs are split across processes.
+# Below the threshold, worker start-up + re-parsing the file costs more than it saves.
+PDF_PARALLEL_MIN_PAGES = 24
+PDF_MAX_WORKERS = 4
+
+def _extract_range(args: Tuple[str, int, int]) -> str:
+    """
+    Worker: text of pages [start, stop) of the PDF at path (one PdfReader per range).
+    """
+    path, start, stop = args
+    reader = PdfReader(path)
+    text = ""
+    for i in range(start, stop):
+        t = reader.pages[i].extract_text()
+        if t:
+            text += t + "\n"
+    return text
+
 def load_pdf_text(file_path: Path) -> str:
     """
     Loads plaintext from a PDF (page-by-page).
@@ -12,6 +32,13 @@ def load_pdf_text(file_path: Path) -> str:
     text = ""
     try:
         reader = PdfReader(str(file_path))
+        n_pages = len(reader.pages)
+        workers = min(PDF_MAX_WORKERS, os.cpu_count() or 1)
+        if n_pages >= PDF_PARALLEL_MIN_PAGES and workers > 1:
+            step = -(-n_pages // workers)  # ceil: one contiguous page range per worker
+            ranges = [(str(file_path), i, min(i + step, n_pages)) for i in range(0, n_pages, step)]
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                return "".join(ex.map(_extract_range, ranges))
         for p in reader.pages:
             t = p.extract_text()
             if t:
@@ -20,6 +47,25 @@ def load_pdf_text(file_path: Path) -> str:
         st.error(f"PDF read error: {e}")
     return text
 
+PDF_TEXT_FILE = "pdf_text.txt"
+
+def load_pdf_text_cached(file_path: Path, cache_dir: Path) -> str:
+    """
+    load_pdf_text backed by a plaintext sidecar in cache_dir (usually the index folder).
+    Re-extracts only when the sidecar is missing or older than the PDF.
+    """
+    cache_file = cache_dir / PDF_TEXT_FILE
+    if cache_file.exists() and (
+        not file_path.exists() or cache_file.stat().st_mtime >= file_path.stat().st_mtime
+    ):
+        return cache_file.read_text(encoding="utf-8")
+
+    text = load_pdf_text(file_path)
+    if text:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(text, encoding="utf-8")
+    return text
+
 def split_text(text: str, chunk_size: int = 2200, chunk_overlap: int = 200) -> List[str]:
     """
     Splits text for vector indexing. Slightly larger chunks help with tables.
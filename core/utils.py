@@ -2,7 +2,8 @@
 from typing import List, Dict, Tuple
 import io
 import csv
-import json
+
+import orjson
 
 def group_by_category(items: List[Dict], categories: List[str]) -> Dict[str, List[Dict]]:
     """
@@ -22,7 +23,7 @@ def make_downloads(items: List[Dict]) -> Tuple[bytes, bytes]:
     Returns (json_bytes, csv_bytes) for the report, including EU enrichment fields.
     """
     # JSON
-    json_bytes = json.dumps(items, ensure_ascii=False, indent=2).encode("utf-8")
+    json_bytes = orjson.dumps(items, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
 
     # CSV
     csv_io = io.StringIO()
@@ -47,9 +48,9 @@ def make_downloads(items: List[Dict]) -> Tuple[bytes, bytes]:
         "eu_function_sv",
         "eu_policy_item_id",
     ]
-    writer = csv.DictWriter(csv_io, fieldnames=fieldnames)
-    writer.writeheader()
-    for it in items:
-        writer.writerow({k: it.get(k, "") for k in fieldnames})
+    # Plain writer over row lists: one writerows call, no per-row dict building
+    writer = csv.writer(csv_io)
+    writer.writerow(fieldnames)
+    writer.writerows([it.get(k, "") for k in fieldnames] for it in items)
 
     return json_bytes, csv_io.getvalue().encode("utf-8")
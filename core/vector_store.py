@@ -1,12 +1,41 @@
 # core/vector_store.py
 from pathlib import Path
+import hashlib
+import pickle
 import shutil
 import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+import faiss
+import numpy as np
 import streamlit as st
-from typing import List
+from typing import List, Optional, Tuple
+from langchain_core.documents import Document
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 from langchain_huggingface import HuggingFaceEmbeddings
-from .pdf_utils import load_pdf_text, split_text
+from .pdf_utils import load_pdf_text_cached, split_text
+
+# Compressed index: OPQ rotation -> IVF (HNSW coarse quantizer) -> 32-byte PQ codes.
+# IVF/PQ training needs ~39 points per centroid; smaller corpora stay on exact IndexFlatL2.
+FAISS_FACTORY = "OPQ32,IVF256_HNSW32,PQ32"
+FAISS_MIN_TRAIN = 256 * 39
+FAISS_NPROBE = 8
+
+# Sidecar with the SHA-256 of the source PDF the index was built from
+CHECKSUM_FILE = "source.sha256"
+# Sidecar flag: "1" if the indexed text is (partly) Swedish, so SV retrieval probes are worthwhile
+SV_FLAG_FILE = "has_sv.flag"
+# Common Swedish words with no English look-alike, matched as whole words
+_SV_WORD_RE = re.compile(r"\b(?:och|eller|inte|också|samt|från|är|för|att|ämnen?|medel)\b")
+SV_MIN_WORD_HITS = 5  # a stray Swedish ingredient name in an English PDF is not enough
+
+# MRU cache of search results keyed by (id(vs), query, k); labels repeat common tokens
+DOCS_CACHE_MAX = 4096
+_DOCS_CACHE: "OrderedDict[Tuple[int, str, int], List[Document]]" = OrderedDict()
+_DOCS_CACHE_LOCK = threading.Lock()
 
 def get_embeddings():
     """
@@ -28,16 +57,117 @@ def faiss_files_exist(index_path: Path) -> bool:
     pkl_docstore = index_path / "docstore.pkl"
     return faiss_file.exists() and (pkl_index.exists() or pkl_docstore.exists())
 
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def index_matches_source(index_path: Path, pdf_path: Path) -> bool:
+    """
+    True unless the checksum sidecar proves the index was built from a different PDF.
+    Indexes without a sidecar (or with the PDF missing) are trusted as-is; the loader then
+    records the current PDF's checksum so later changes are detected.
+    """
+    sidecar = index_path / CHECKSUM_FILE
+    if not sidecar.exists() or not pdf_path.exists():
+        return True
+    return sidecar.read_text(encoding="utf-8").strip() == _file_sha256(pdf_path)
+
+def _write_sv_flag(index_path: Path, text: str) -> bool:
+    hits = 0
+    for _ in _SV_WORD_RE.finditer(text.lower()):
+        hits += 1
+        if hits >= SV_MIN_WORD_HITS:
+            break
+    has_sv = hits >= SV_MIN_WORD_HITS
+    (index_path / SV_FLAG_FILE).write_text("1" if has_sv else "0", encoding="utf-8")
+    return has_sv
+
+def index_has_sv(index_path: Path) -> bool:
+    """
+    Whether the indexed PDF has Swedish content. Unknown (no flag yet) counts as True.
+    """
+    flag = index_path / SV_FLAG_FILE
+    if not flag.exists():
+        return True
+    return flag.read_text(encoding="utf-8").strip() != "0"
+
+def _tune_index(index: faiss.Index) -> faiss.Index:
+    """
+    Apply search-time parameters (IVF nprobe); no-op for flat indexes.
+    """
+    try:
+        faiss.extract_index_ivf(index).nprobe = FAISS_NPROBE
+    except Exception:
+        pass
+    return index
+
+def _build_index(vectors: np.ndarray) -> faiss.Index:
+    """
+    OPQ+IVF+PQ when the corpus is large enough to train it, exact L2 otherwise.
+    """
+    n, d = vectors.shape
+    if n >= FAISS_MIN_TRAIN:
+        index = faiss.index_factory(d, FAISS_FACTORY)
+        index.train(vectors)
+    else:
+        index = faiss.IndexFlatL2(d)
+    index.add(vectors)
+    return _tune_index(index)
+
 def create_vector_store(chunks: List[str], save_path: Path) -> FAISS:
     """
     Build FAISS from chunks and persist to disk.
     """
     embeddings = get_embeddings()
-    vs = FAISS.from_texts(chunks, embedding=embeddings)
+    vectors = np.asarray(embeddings.embed_documents(chunks), dtype=np.float32)
+    ids = [str(uuid.uuid4()) for _ in chunks]
+    vs = FAISS(
+        embedding_function=embeddings,
+        index=_build_index(vectors),
+        docstore=InMemoryDocstore({i: Document(page_content=c) for i, c in zip(ids, chunks)}),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
     save_path.mkdir(parents=True, exist_ok=True)
     vs.save_local(str(save_path))
     return vs
 
+def load_local_mmap(index_path: Path, embeddings) -> FAISS:
+    """
+    Load a LangChain FAISS store with the index memory-mapped read-only,
+    so cold starts only page in what searches touch instead of re-embedding.
+    IO_FLAG_MMAP_IFC maps flat codes and IVF lists alike (IO_FLAG_MMAP alone only maps
+    IVF lists, so an IndexFlatL2 would still be read fully into RAM).
+    """
+    faiss_file = str(index_path / "index.faiss")
+    index = None
+    for flags in (getattr(faiss, "IO_FLAG_MMAP_IFC", None), faiss.IO_FLAG_MMAP):
+        if flags is None:  # faiss builds without in-file-codes mmap
+            continue
+        try:
+            index = faiss.read_index(faiss_file, flags | faiss.IO_FLAG_READ_ONLY)
+            break
+        except Exception:
+            pass
+    if index is None:
+        # Some index types/builds do not support mmap; a plain read is still cheap
+        index = faiss.read_index(faiss_file)
+
+    pkl = index_path / "index.pkl"
+    if not pkl.exists():
+        pkl = index_path / "docstore.pkl"
+    with open(pkl, "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+
+    return FAISS(
+        embedding_function=embeddings,
+        index=_tune_index(index),
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
+    )
+
 def load_or_create_vector_store(
     pdf_path: Path,
     index_path: Path,
@@ -46,16 +176,26 @@ def load_or_create_vector_store(
 ) -> FAISS:
     """
     Load existing FAISS if possible, otherwise build once and reuse.
-    Rebuild only if explicitly asked or if load fails (format mismatch).
+    Rebuild only if explicitly asked, if the source PDF changed, or if load fails (format mismatch).
     """
     embeddings = get_embeddings()
 
     if force_rebuild and index_path.exists():
         shutil.rmtree(index_path, ignore_errors=True)
 
+    if faiss_files_exist(index_path) and not index_matches_source(index_path, pdf_path):
+        if verbose:
+            st.warning("Source PDF changed since the FAISS index was built; rebuilding…")
+        shutil.rmtree(index_path, ignore_errors=True)
+
     if faiss_files_exist(index_path):
         try:
-            vs = FAISS.load_local(str(index_path), embeddings, allow_dangerous_deserialization=True)
+            vs = load_local_mmap(index_path, embeddings)
+            if not (index_path / CHECKSUM_FILE).exists() and pdf_path.exists():
+                # indexes shipped/built without a sidecar: pin them to the PDF they are used with
+                (index_path / CHECKSUM_FILE).write_text(_file_sha256(pdf_path), encoding="utf-8")
+            if not (index_path / SV_FLAG_FILE).exists() and pdf_path.exists():
+                _write_sv_flag(index_path, load_pdf_text_cached(pdf_path, index_path))  # indexes built before the flag existed
             if verbose:
                 st.info(f"Loaded FAISS index from disk: {index_path}")
             return vs
@@ -65,20 +205,75 @@ def load_or_create_vector_store(
             shutil.rmtree(index_path, ignore_errors=True)
 
     # Build fresh
-    text = load_pdf_text(pdf_path)
+    text = load_pdf_text_cached(pdf_path, index_path)
     chunks = split_text(text)
     if verbose:
         st.info(f"Building FAISS index (chunks={len(chunks)}) → {index_path}")
-    return create_vector_store(chunks, index_path)
+    vs = create_vector_store(chunks, index_path)
+    (index_path / CHECKSUM_FILE).write_text(_file_sha256(pdf_path), encoding="utf-8")
+    _write_sv_flag(index_path, text)
+    return vs
+
+def _docs_cache_get(key: Tuple[int, str, int]) -> Optional[List[Document]]:
+    with _DOCS_CACHE_LOCK:
+        docs = _DOCS_CACHE.get(key)
+        if docs is not None:
+            _DOCS_CACHE.move_to_end(key)
+        return docs
+
+def _docs_cache_put(key: Tuple[int, str, int], docs: List[Document]) -> None:
+    with _DOCS_CACHE_LOCK:
+        _DOCS_CACHE[key] = docs
+        _DOCS_CACHE.move_to_end(key)
+        while len(_DOCS_CACHE) > DOCS_CACHE_MAX:
+            _DOCS_CACHE.popitem(last=False)
 
 def similarity_docs(vs: FAISS, query: str, k: int = 4):
     """
-    Vector search with defensive guards.
+    Vector search with defensive guards. Results are cached per (store, query, k);
+    failed searches are not cached.
     """
     if not query or not vs:
         return []
+    key = (id(vs), query, k)
+    docs = _docs_cache_get(key)
+    if docs is not None:
+        return docs
     try:
-        return vs.similarity_search(query, k=k)
+        docs = vs.similarity_search(query, k=k)
     except Exception as e:
         st.error(f"Vector search error: {e}")
         return []
+    _docs_cache_put(key, docs)
+    return docs
+
+def similarity_docs_batch(vs: FAISS, queries: List[str], k: int = 4) -> List[List[Document]]:
+    """
+    Batched vector search: one embedding call + one FAISS search for all uncached queries.
+    Returns one list of documents per query (same order as `queries`).
+    """
+    if not queries or not vs:
+        return [[] for _ in queries]
+
+    found = {q: _docs_cache_get((id(vs), q, k)) for q in dict.fromkeys(queries)}
+    misses = [q for q, docs in found.items() if docs is None]
+    if misses:
+        try:
+            xq = np.asarray(vs.embedding_function.embed_documents(misses), dtype=np.float32)
+            _, I = vs.index.search(xq, k)
+        except Exception as e:
+            st.error(f"Vector search error: {e}")
+            return [[] for _ in queries]
+
+        for q, row in zip(misses, I):
+            docs = []
+            for i in row:
+                if i == -1:  # FAISS pads with -1 when fewer than k hits
+                    continue
+                doc = vs.docstore.search(vs.index_to_docstore_id[int(i)])
+                if isinstance(doc, Document):
+                    docs.append(doc)
+            found[q] = docs
+            _docs_cache_put((id(vs), q, k), docs)
+
+    return [found[q] for q in queries]